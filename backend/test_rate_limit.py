@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import app as quiz_app
+
+
+def make_request(forwarded_for):
+    """Request arriving from Render's proxy with the given X-Forwarded-For"""
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/api/quizzes",
+        "headers": [(b"x-forwarded-for", forwarded_for.encode())],
+        "client": ("10.0.0.1", 443),
+        "app": quiz_app.app,
+    })
+
+
+def test_spoofed_forwarded_for_shares_the_real_client_bucket(monkeypatch):
+    monkeypatch.setattr(quiz_app, "TRUSTED_PROXY_HOPS", 1)
+    monkeypatch.setattr(quiz_app, "QUIZ_WRITE_BURST", 2.0)
+    quiz_app.app.state.buckets = {}
+
+    # The client controls everything left of the entry the proxy appends
+    for spoofed in ["6.6.6.6", "7.7.7.7"]:
+        asyncio.run(quiz_app.rate_limit_writes(make_request(f"{spoofed}, 203.0.113.7")))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(quiz_app.rate_limit_writes(make_request("8.8.8.8, 203.0.113.7")))
+    assert exc.value.status_code == 429
+    assert list(quiz_app.app.state.buckets) == ["203.0.113.7"]